@@ -25,9 +25,23 @@ from cockpit.handlers.deviceHandler import STATES
 from cockpit.handlers.filterHandler import FilterHandler, Filter
 from cockpit import depot
 from cockpit import events
+import cockpit.util.threads
+import Pyro4
+import threading
 import wx
 
 
+## Time to wait for further selections before moving, in ms.
+MOVE_DELAY_MS = 150
+## Time between status checks while the device is moving, in ms.
+STATUS_BUSY_INTERVAL_MS = 250
+## Times between status checks after each successive check that finds
+## no change, in ms.
+STATUS_IDLE_INTERVALS_MS = (1000, 2000, 5000)
+## Time to wait for a status reply before treating it as lost, in s.
+STATUS_TIMEOUT_S = 10
+
+
 class ClaritySlideHandler(FilterHandler):
     def __init__(self, *args, **kwargs):
         """Subclass FilterHandler for Clarity slider position"""
@@ -46,17 +60,103 @@ class ClaritySlideHandler(FilterHandler):
 class Clarity(microscopeDevice.MicroscopeFilter):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        # The slides are fixed, so only query them once.
+        self._slides = None
+        # Whether a status request is waiting for the device to reply.
+        self._statusPending = False
+        # Set to ask the status worker for a status, and to let it
+        # see that the device is shutting down.
+        self._statusRequested = threading.Event()
+        self._exiting = False
+        # Last known slide and filter positions, keyed by 'slide' and
+        # 'filter', updated from the status and read from any thread.
+        self._positions = {}
+        self._positionsLock = threading.Lock()
+        # Moves waiting for the selection to settle, as wx.CallLater
+        # instances keyed by what is being moved.
+        self._pendingMoves = {}
+        # The last status and how many checks in a row have reported
+        # it, to back off checking an idle device.
+        self._lastStatus = None
+        self._idleChecks = 0
+
+    def initialize(self):
+        super().initialize()
+        self._statusWorker(self._proxy._pyroUri)
+
+    def onExit(self) -> None:
+        self._exiting = True
+        self._statusRequested.set()
+        super().onExit()
+
+    def _getCachedPosition(self, key, query):
+        """Return the last known position for key, or query the device."""
+        with self._positionsLock:
+            position = self._positions.get(key)
+        if position is None:
+            position = query()
+            with self._positionsLock:
+                self._positions[key] = position
+        return position
+
+    def _setCachedPosition(self, key, position):
+        """Set the last known position for key; None to forget it."""
+        with self._positionsLock:
+            self._positions[key] = position
 
     def checkStatus(self, event):
-        busy = False
+        """Request the device status without waiting for the reply."""
+        if self._statusPending:
+            # Still waiting on the previous request, e.g. the network
+            # is slow.  Don't let requests queue up, but keep the
+            # timer going in case the reply never arrives.
+            self._timer.StartOnce(STATUS_IDLE_INTERVALS_MS[-1])
+            return
+        self._statusPending = True
+        self._statusRequested.set()
+
+    @cockpit.util.threads.callInNewThread
+    def _statusWorker(self, uri):
+        """Fetch and apply the device status each time it is requested."""
+        # One thread with its own connection serves every status
+        # check, so the checks don't cost a thread and a connection
+        # each.  The timeout stops a hung device from blocking it for
+        # good; Pyro closes the connection then, and reconnects on
+        # the next call.
+        proxy = Pyro4.Proxy(uri)
+        proxy._pyroTimeout = STATUS_TIMEOUT_S
+        while True:
+            self._statusRequested.wait()
+            self._statusRequested.clear()
+            if self._exiting:
+                break
+            try:
+                status = proxy.get_status()
+            except:
+                status = {}
+            self._applyStatus(status)
+        proxy._pyroRelease()
+
+    @cockpit.util.threads.callInMainThread
+    def _applyStatus(self, status):
+        """Show a status reported by the device and schedule the next check."""
+        self._statusPending = False
+        # The timer is one-shot, so it must be restarted even if the
+        # status can't be applied, or the checks stop for good.
         try:
-            status = self._proxy.get_status()
-        except:
-            status = {}
+            self._showStatus(status)
+        finally:
+            self._scheduleStatusCheck(status)
+
+    def _showStatus(self, status):
+        """Update the UI and handlers with a status reported by the device."""
         connected = status.get('connected', False)
-        mode_selector = self.buttons['mode']
-        mode_selector.SetSelection(mode_selector.FindString(status.get('mode', '')))
-        self.panel.Enable(connected)
+        # The handlers still need the status while the panel is
+        # hidden, e.g. for the filter control on the filters panel,
+        # but there is no point updating widgets nobody can see.  They
+        # catch up on the first check after the panel is shown again.
+        if self.panel.IsShownOnScreen():
+            self._updateWidgets(status, connected)
         if not connected:
             state = STATES.error
         else:
@@ -66,24 +166,92 @@ class Clarity(microscopeDevice.MicroscopeFilter):
                 state = STATES.enabled
             else:
                 state = STATES.disabled
-            self.buttons['door'].SetValue(status['door open'])
+        # The status already includes the slide and filter positions,
+        # so keep them for the handlers instead of making another
+        # round-trip to the device for each of them.
+        for key in ['slide', 'filter']:
+            if key in status:
+                position = status[key]
+                # Positions are reported as (position, label) pairs.
+                if isinstance(position, (tuple, list)):
+                    position = position[0]
+                self._setCachedPosition(key, position)
         for h in self.handlers:
             events.publish(events.DEVICE_STATUS, h, state)
             if state not in [STATES.error, STATES.busy]:
                 h.updateAfterMove()
 
+    def _updateWidgets(self, status, connected):
+        """Show the status on the panel."""
+        # Setting the widgets on every update causes needless
+        # refreshes, so only touch them when something changed, and
+        # then all together.
+        mode_selector = self.buttons['mode']
+        mode = mode_selector.FindString(status.get('mode', ''))
+        door = self.buttons['door']
+        door_open = status.get('door open', door.GetValue())
+        if (mode == mode_selector.GetSelection()
+                and connected == self.panel.IsEnabled()
+                and door_open == door.GetValue()):
+            return
+        self.panel.Freeze()
+        try:
+            mode_selector.SetSelection(mode)
+            self.panel.Enable(connected)
+            door.SetValue(door_open)
+        finally:
+            self.panel.Thaw()
+
+    def _scheduleStatusCheck(self, status):
+        """Start the timer for the next status check.
+
+        Check often while the device is moving, and less and less
+        often while nothing changes.
+        """
+        if status.get('busy', False):
+            self._idleChecks = 0
+            interval = STATUS_BUSY_INTERVAL_MS
+        else:
+            if status == self._lastStatus:
+                self._idleChecks = min(self._idleChecks + 1,
+                                       len(STATUS_IDLE_INTERVALS_MS) - 1)
+            else:
+                self._idleChecks = 0
+            interval = STATUS_IDLE_INTERVALS_MS[self._idleChecks]
+            if not self.panel.IsShownOnScreen():
+                # Only the handlers are using it, so check less often.
+                interval = STATUS_IDLE_INTERVALS_MS[-1]
+        self._lastStatus = status
+        self._timer.StartOnce(interval)
+
+    @cockpit.util.threads.callInMainThread
+    def _checkStatusSoon(self):
+        """Check the status shortly, however long the device was idle.
+
+        Used after anything is selected on the panel, so that the
+        panel soon shows what the device did, or its original state
+        if the device ignored the selection.
+        """
+        self._idleChecks = 0
+        self._timer.StartOnce(STATUS_BUSY_INTERVAL_MS)
+
     def setEnabled(self, state):
         if state:
             self._proxy.enable()
         else:
             self._proxy.disable()
+        self._checkStatusSoon()
+
+    def setMode(self, mode):
+        self.set_setting('mode', mode)
+        self._checkStatusSoon()
 
     def getHandlers(self):
         """Return device handlers."""
         super().getHandlers()
         h = ClaritySlideHandler(self.name + "_slide", 'clarity', False,
                                 {'setPosition': self.set_slide_position,
-                                 'getPosition': self._proxy.get_slide_position,
+                                 'getPosition': self.get_slide_position,
                                  'getFilters': self.get_slides_as_filters,
                                  'getIsEnabled': self._proxy.get_is_enabled,
                                  'setEnabled': self.setEnabled},
@@ -92,14 +260,58 @@ class Clarity(microscopeDevice.MicroscopeFilter):
         self.handlers.append(h)
         return self.handlers
 
+    @cockpit.util.threads.callInMainThread
+    def _deferMove(self, key, move):
+        """Call move once no other move for key is requested for a while.
+
+        Going through the items of a wx.Choice, e.g. with the mouse
+        wheel or arrow keys, selects each one in turn.  Only the last
+        selection should make the hardware move.
+        """
+        pending = self._pendingMoves.pop(key, None)
+        if pending is not None:
+            pending.Stop()
+        def start():
+            del self._pendingMoves[key]
+            move()
+            # Watch the move instead of waiting for an idle check.
+            self._checkStatusSoon()
+        self._pendingMoves[key] = wx.CallLater(MOVE_DELAY_MS, start)
+
     def set_slide_position(self, position, callback=None):
-        import Pyro4
-        asproxy = Pyro4.Proxy(self._proxy._pyroUri)
-        asproxy._pyroAsync()
-        result = asproxy.set_slide_position(position).then(callback)
+        def onMoved(result):
+            # Read the position the slide actually ended up at.
+            self._setCachedPosition('slide', None)
+            if callback is not None:
+                callback(result)
+        def move():
+            asproxy = Pyro4.Proxy(self._proxy._pyroUri)
+            asproxy._pyroAsync()
+            asproxy.set_slide_position(position).then(onMoved)
+        self._deferMove('slide', move)
+
+    def get_slide_position(self):
+        return self._getCachedPosition('slide', self._proxy.get_slide_position)
 
     def get_slides_as_filters(self):
-        return [Filter(k, v) for k, v in self._proxy.get_slides().items()]
+        if self._slides is None:
+            self._slides = [Filter(k, v)
+                            for k, v in self._proxy.get_slides().items()]
+        return self._slides
+
+    def setPosition(self, position, callback=None):
+        def onMoved(result):
+            # Read the position the filter actually ended up at, which
+            # need not be the one requested.
+            self._setCachedPosition('filter', None)
+            if callback is not None:
+                callback(result)
+        def move():
+            super(Clarity, self).setPosition(position, callback=onMoved)
+        self._deferMove('filter', move)
+
+    def getPosition(self):
+        return self._getCachedPosition('filter', super().getPosition)
 
     def makeUI(self, parent):
         """Draw the Clarity's UI"""
@@ -110,7 +322,8 @@ class Clarity(microscopeDevice.MicroscopeFilter):
         # Clarity's filter control on the Filters panel, but resolving that
         # is not straightforward. If that control is used to select a filter
         # when the Clarity is not enabled, it will not change the filter, and
-        # will redisplay its original state within 1 second.
+        # will redisplay its original state at the next status check,
+        # which follows shortly after any selection.
         outer = wx.Panel(parent, style=wx.BORDER_RAISED)
         outer.Sizer = wx.BoxSizer(wx.VERTICAL)
         panel = wx.Panel(outer)
@@ -141,8 +354,7 @@ class Clarity(microscopeDevice.MicroscopeFilter):
         mode_selector = cockpit.gui.device.EnumChoice(panel)
         mode_selector.Set(self.describe_setting('mode')['values'])
         self.buttons['mode'] = mode_selector
-        from functools import partial
-        mode_selector.setOnChoice(partial(self.set_setting, 'mode'))
+        mode_selector.setOnChoice(self.setMode)
         panel.Sizer.Add(mode_selector)
         # door status indicator
         cb = wx.CheckBox(panel, wx.ID_ANY, "door open")
@@ -151,7 +363,7 @@ class Clarity(microscopeDevice.MicroscopeFilter):
         panel.Sizer.Add(cb)
         # Start a timer to report connection errors.
         self._timer = wx.Timer(panel)
-        self._timer.Start(1000)
+        self._timer.StartOnce(STATUS_IDLE_INTERVALS_MS[0])
         panel.Bind(wx.EVT_TIMER, self.checkStatus, self._timer)
         panel.Fit()
         self.panel = panel
@@ -22,6 +22,7 @@
 """Cameras from Python Microscope device server."""
 
 import decimal
+import re
 import Pyro4
 import wx
 
@@ -45,6 +46,31 @@ from microscope import TriggerMode, TriggerType
 # Pseudo-enum to track whether device defaults in place.
 (DEFAULTS_NONE, DEFAULTS_PENDING, DEFAULTS_SENT) = range(3)
 
+# Patterns to shorten readout mode names.
+_CHRE = re.compile(r' CH([0-9]+)', re.IGNORECASE)
+_AMPRE = re.compile(r'CONVENTIONAL ', re.IGNORECASE)
+
+# Cockpit does not support all possible comabinations of trigger type
+# and mode from Microscope.
+_MICROSCOPE_TRIGGER_TO_COCKPIT_EXPOSURE = {
+    (
+        TriggerType.SOFTWARE,
+        TriggerMode.ONCE,
+    ): cockpit.handlers.camera.TRIGGER_SOFT,
+    (
+        TriggerType.HIGH,
+        TriggerMode.ONCE,
+    ): cockpit.handlers.camera.TRIGGER_BEFORE,
+    (
+        TriggerType.LOW,
+        TriggerMode.ONCE
+    ): cockpit.handlers.camera.TRIGGER_AFTER,
+    (
+        TriggerType.HIGH,
+        TriggerMode.BULB,
+    ): cockpit.handlers.camera.TRIGGER_DURATION,
+}
+
 
 class MicroscopeCamera(MicroscopeBase, CameraDevice):
     """A class to control remote python microscope cameras."""
@@ -54,6 +80,14 @@ class MicroscopeCamera(MicroscopeBase, CameraDevice):
         self.enabled = False
         self.panel = None
         self.modes = []
+        # Name of the event for new images, formatted once since it
+        # is needed for every frame.
+        self._newImageEvent = events.NEW_IMAGE % self.name
+        # Blank image published in place of dropped frames, or None
+        # until it is needed at the current image size.
+        self._droppedFrame = None
+        # Names of the types the remote returned as plain tuples.
+        self._tuplesReturned = set()
 
     def initialize(self):
         # Parent class will connect to proxy
@@ -78,19 +112,16 @@ class MicroscopeCamera(MicroscopeBase, CameraDevice):
         # [amp-type] [freq] [channel]
         if not self.modes:
             return ['default']
-        import re
         channels = set()
-        chre = re.compile(r' CH([0-9]+)', re.IGNORECASE)
-        ampre = re.compile(r'CONVENTIONAL ', re.IGNORECASE)
         modes = []
         for i, m in self.modes:
-            modes.append(ampre.sub('CONV ', m))
-            match = chre.search(m)
+            modes.append(_AMPRE.sub('CONV ', m))
+            match = _CHRE.search(m)
             if match:
-                channels.union(match.groups())
+                channels.update(match.groups())
 
         if len(channels) < 2:
-            modes = [chre.sub('', m) for m in modes]
+            modes = [_CHRE.sub('', m) for m in modes]
         return modes
 
     def finalizeInitialization(self):
@@ -105,6 +136,8 @@ class MicroscopeCamera(MicroscopeBase, CameraDevice):
         if settings is not None:
             self._proxy.update_settings(settings)
         self.settings.update(self._proxy.get_all_settings())
+        # The image size may have changed.
+        self._droppedFrame = None
         events.publish(events.SETTINGS_CHANGED % str(self))
 
 
@@ -162,27 +195,7 @@ class MicroscopeCamera(MicroscopeBase, CameraDevice):
         self.setAnyDefaults()
 
     def _getCockpitExposureMode(self) -> int:
-        # Cockpit does not support all possible comabinations of
-        # trigger type and mode from Microscope.
-        microscope_trigger_to_cockpit_exposure = {
-            (
-                TriggerType.SOFTWARE,
-                TriggerMode.ONCE,
-            ): cockpit.handlers.camera.TRIGGER_SOFT,
-            (
-                TriggerType.HIGH,
-                TriggerMode.ONCE,
-            ): cockpit.handlers.camera.TRIGGER_BEFORE,
-            (
-                TriggerType.LOW,
-                TriggerMode.ONCE
-            ): cockpit.handlers.camera.TRIGGER_AFTER,
-            (
-                TriggerType.HIGH,
-                TriggerMode.BULB,
-            ): cockpit.handlers.camera.TRIGGER_DURATION,
-        }
-        return microscope_trigger_to_cockpit_exposure[
+        return _MICROSCOPE_TRIGGER_TO_COCKPIT_EXPOSURE[
             (self._proxy.trigger_type, self._proxy.trigger_mode)
         ]
 
@@ -256,17 +269,30 @@ class MicroscopeCamera(MicroscopeBase, CameraDevice):
 
     def getImageSize(self, name):
         """Read the image size from the camera."""
-        roi = self._proxy.get_roi()  # left, bottom, right, top
+        # Fetch both in a single round-trip.
+        batch = Pyro4.batch(self._proxy)
+        batch.get_roi()  # left, bottom, right, top
+        batch.get_binning()
+        roi, binning = batch()
         if not isinstance(roi, ROI):
-            cockpit.util.logger.log.warning("%s returned tuple not ROI()" % self.name)
+            self._warnTupleReturned('ROI')
             roi = ROI(*roi)
-        binning = self._proxy.get_binning()
         if not isinstance(binning, Binning):
-            cockpit.util.logger.log.warning("%s returned tuple not Binning()" % self.name)
+            self._warnTupleReturned('Binning')
             binning = Binning(*binning)
         return (roi.width//binning.h, roi.height//binning.v)
 
 
+    def _warnTupleReturned(self, typename):
+        # The remote will keep returning tuples, so only warn once
+        # instead of every time the image size is read.
+        if typename in self._tuplesReturned:
+            return
+        self._tuplesReturned.add(typename)
+        cockpit.util.logger.log.warning("%s returned tuple not %s()"
+                                        % (self.name, typename))
+
+
     def getSavefileInfo(self, name):
         """Return an info string describing the measurement."""
         #return "%s: %s image" % (name, self.imageSize)
@@ -280,9 +306,11 @@ class MicroscopeCamera(MicroscopeBase, CameraDevice):
         before another can be started, in milliseconds."""
         # Camera uses time in s; cockpit uses ms.
         #Note cycle time is exposure+Readout!
-        t_cyc = self._proxy.get_cycle_time() * 1000.0
-        t_exp = self._proxy.get_exposure_time() * 1000.0
-        t = t_cyc - t_exp
+        batch = Pyro4.batch(self._proxy)
+        batch.get_cycle_time()
+        batch.get_exposure_time()
+        t_cyc, t_exp = batch()
+        t = (t_cyc - t_exp) * 1000.0
         if isExact:
             result = decimal.Decimal(t)
         else:
@@ -293,20 +321,37 @@ class MicroscopeCamera(MicroscopeBase, CameraDevice):
     def prepareForExperiment(self, name, experiment):
         """Make the hardware ready for an experiment."""
         self.cached_settings.update(self.settings)
+        # Have the image for dropped frames ready before they happen.
+        self._droppedFrame = self._makeDroppedFrame()
+
+
+    def _makeDroppedFrame(self):
+        """Return an empty image to publish in place of dropped frames."""
+        # Fetching the size is a call to the remote, so this is done
+        # only when the size may have changed, and the same image is
+        # published for every dropped frame until then.
+        size = self.handler.getImageSize()
+        # Images are saved as uint16, so match that.
+        frame = np.zeros(size, dtype=np.uint16)
+        # The same array is published every time, so make sure
+        # subscribers can't modify it.
+        frame.setflags(write=False)
+        return frame
 
 
     def receiveData(self, *args):
         """This function is called when data is received from the hardware."""
         (image, timestamp) = args
         if not isinstance(image, Exception):
-            events.publish(events.NEW_IMAGE % self.name, image, timestamp)
+            events.publish(self._newImageEvent, image, timestamp)
         else:
             # Handle the dropped frame by publishing an empty image of the correct
-            # size. Use the handler to fetch the size, as this will use a cached value,
-            # if available.
-            events.publish(events.NEW_IMAGE % self.name,
-                           np.zeros(self.handler.getImageSize(), dtype=np.int16),
-                           timestamp)
+            # size.
+            frame = self._droppedFrame
+            if frame is None:
+                frame = self._makeDroppedFrame()
+                self._droppedFrame = frame
+            events.publish(self._newImageEvent, frame, timestamp)
             raise image
 
 
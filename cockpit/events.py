@@ -201,7 +201,10 @@ class Publisher:
     def publish(self, event: str, *args, **kwargs):
         """Call all functions subscribed to specific event with given arguments.
         """
-        for func in self._subscriptions[event]:
+        # Use get instead of indexing the defaultdict so that events
+        # without subscribers, such as NEW_IMAGE on every frame for
+        # the one shot publisher, don't add and remove an empty list.
+        for func in self._subscriptions.get(event, []):
             try:
                 func(*args, **kwargs)
             except:
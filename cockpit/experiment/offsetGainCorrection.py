@@ -60,6 +60,7 @@ from cockpit.experiment import experiment
 from cockpit.gui import guiUtils
 import cockpit.handlers.camera
 import cockpit.util.datadoc
+import cockpit.util.logger
 import cockpit.util.threads
 import cockpit.util.userConfig
 
@@ -155,7 +156,7 @@ class OffsetGainCorrectionExperiment(experiment.Experiment):
         for i in range(self.numCollections):
             if not activeCameras or self.shouldAbort:
                 break
-            print ("Running with cams",activeCameras)
+            cockpit.util.logger.log.debug("Running with cams %s", activeCameras)
             self.camToImages = {}
             self.camToNumImagesReceived = {}
             self.camToLock = {}
@@ -187,7 +188,8 @@ class OffsetGainCorrectionExperiment(experiment.Experiment):
             else:
                 multiplier *= self.exposureMultiplier
             activeCameras = self.processImages(multiplier)
-            print ("Came out with active cams",activeCameras)
+            cockpit.util.logger.log.debug("Came out with active cams %s",
+                                          activeCameras)
 
         for camera, func in self.camToFunc.items():
             events.unsubscribe(events.NEW_IMAGE % camera.name, func)
@@ -54,6 +54,8 @@ class RotatorSweepExperiment(experiment.Experiment):
         vStart, vLessThan, vSteps = self.vRange
         dv = float(vLessThan - vStart) / float(vSteps)
         dt = decimal.Decimal(self.settlingTime)
+        # Time to advance between actions to keep them strictly ordered.
+        orderingDelay = decimal.Decimal('.001')
 
         for step in range(vSteps):
             # Move to next polarization rotator voltage.
@@ -65,7 +67,7 @@ class RotatorSweepExperiment(experiment.Experiment):
                 curTime = self.expose(curTime, cameras, lightTimePairs, table)
                 # Advance the time very slightly so that all exposures
                 # are strictly ordered.
-                curTime += decimal.Decimal('.001')
+                curTime += orderingDelay
             # Hold the rotator angle constant during the exposure.
             table.addAction(curTime, self.lineHandler, vTarget)
             # Advance time slightly so all actions are sorted (e.g. we
@@ -248,6 +248,10 @@ class SIExperiment(experiment.Experiment):
             # Wait a few ms for any necessary SLM triggers.
             curTime = decimal.Decimal('5e-3')
 
+        # Time to advance between actions to keep them strictly ordered,
+        # and to leave after the previous exposure events.
+        orderingDelay = decimal.Decimal('.001')
+        afterLastAction = decimal.Decimal('1e-6')
         for angle, phase, z in self.genSIPositions():
             delayBeforeImaging = 0
             # Figure out which positions changed. They need to be held flat
@@ -256,7 +260,7 @@ class SIExperiment(experiment.Experiment):
             # need to trigger it and then wait for it to stabilize.
             # Ensure we truly are doing this after all exposure events are done.
             curTime = max(curTime,
-                          table.getFirstAndLastActionTimes()[1] + decimal.Decimal('1e-6'))
+                          table.getFirstAndLastActionTimes()[1] + afterLastAction)
             if angle != prevAngle and prevAngle is not None:
                 if self.angleHandler is not None:
                     theta = self.angleHandler.indexedPosition(angle)
@@ -267,7 +271,7 @@ class SIExperiment(experiment.Experiment):
                             motionTime + stabilizationTime)
                 # Advance time slightly so all actions are sorted (e.g. we
                 # don't try to change angle and phase in the same timestep).
-                curTime += decimal.Decimal('.001')
+                curTime += orderingDelay
 
             if phase != prevPhase and prevPhase is not None:
                 if self.phaseHandler is not None:
@@ -281,7 +285,7 @@ class SIExperiment(experiment.Experiment):
                             motionTime + stabilizationTime)
                 # Advance time slightly so all actions are sorted (e.g. we
                 # don't try to change angle and phase in the same timestep).
-                curTime += decimal.Decimal('.001')
+                curTime += orderingDelay
 
             if z != prevZ:
                 if prevZ is not None:
@@ -295,7 +299,7 @@ class SIExperiment(experiment.Experiment):
                             motionTime + stabilizationTime)
                 # Advance time slightly so all actions are sorted (e.g. we
                 # don't try to change angle and phase in the same timestep).
-                curTime += decimal.Decimal('.001')
+                curTime += orderingDelay
 
             prevAngle = angle
             prevPhase = phase
@@ -81,12 +81,16 @@ class FilterHandler(deviceHandler.DeviceHandler):
     def makeSelector(self, parent):
         ctrl = wx.Choice(parent)
         ctrl.Set(list(map(str, self.filters)))
-        ctrl.Bind(wx.EVT_CHOICE, lambda evt: self.setFilter(self.filters[evt.Selection]))
+        ctrl.Bind(wx.EVT_CHOICE, self.onSelectorChoice)
         self.addWatch('lastFilter', lambda f: ctrl.SetSelection(ctrl.FindString(str(f))))
         ctrl.SetSelection(ctrl.FindString(str(self.lastFilter)))
         return ctrl
 
 
+    def onSelectorChoice(self, evt):
+        self.setFilter(self.filters[evt.Selection])
+
+
     def makeUI(self, parent):
         panel = wx.Panel(parent)
         panel.Sizer = wx.BoxSizer(wx.VERTICAL)
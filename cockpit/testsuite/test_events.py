@@ -88,6 +88,14 @@ class TestSubscriptions(TestEvents):
         cockpit.events.publish('other ' + self.event_name)
         self.subscriber.assert_not_called()
 
+    def test_no_subscription_not_recorded(self):
+        """Publishing an event without subscribers does not record it"""
+        cockpit.events.publish('other ' + self.event_name)
+        for publisher in [cockpit.events._publisher,
+                          cockpit.events._one_shot_publisher]:
+            self.assertNotIn('other ' + self.event_name,
+                             publisher._subscriptions)
+
     def test_multiple_subscribers(self):
         extra_subscribers = [unittest.mock.Mock() for i in range(5)]
         for subscriber in extra_subscribers: